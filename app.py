@@ -1,20 +1,17 @@
 import streamlit as st
 from pathlib import Path
-from langchain.agents import create_sql_agent
-from langchain.sql_database import SQLDatabase
-from langchain.agents.agent_types import AgentType
-from langchain.callbacks import StreamlitCallbackHandler
-from langchain.agents.agent_toolkits import SQLDatabaseToolkit
-from sqlalchemy import create_engine
-import sqlite3
-from langchain_groq import ChatGroq
-from urllib.parse import quote_plus
-import pymysql
-import pandas as pd
 from datetime import datetime
 from api_key import groq_api_key
-import glob
+import csv
+import hashlib
+import io
 import os
+import re
+import time
+import uuid
+
+# Heavy modules (LangChain, SQLAlchemy, drivers, embeddings) are imported where
+# they are first needed so the first render is not blocked on them
 
 st.set_page_config(page_title="LangChain: Chat with SQL DB", page_icon="🦜")
 st.title("🦜 LangChain: Chat with SQL DB")
@@ -22,18 +19,26 @@ st.title("🦜 LangChain: Chat with SQL DB")
 LOCALDB = "USE_LOCALDB"
 MYSQL = "USE_MYSQL"
 
-def get_available_databases(base_path="database/local"):
+# Resolved once at import instead of on every call
+PROJECT_ROOT = Path(__file__).resolve().parent
+DB_DIR = PROJECT_ROOT / "database" / "local"
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_available_databases(search_path=DB_DIR):
     """Find all SQLite database files in the specified directory"""
-    project_root = Path(__file__).parent
-    search_path = project_root / base_path
     
-    # Find all database files with common SQLite extensions
-    db_files = []
-    for ext in ['.db', '.sqlite', '.sqlite3']:
-        db_files.extend(list(search_path.glob(f"*{ext}")))
+    # Find all database files with common SQLite extensions in a single directory pass
+    try:
+        with os.scandir(search_path) as entries:
+            db_files = [Path(e.path) for e in entries
+                        if e.is_file() and e.name.endswith(SQLITE_EXTENSIONS)]
+    except FileNotFoundError:
+        return []
     
     # Convert to relative paths for display
-    return [db.relative_to(project_root) for db in db_files]
+    return [db.relative_to(PROJECT_ROOT) for db in db_files]
 
 radio_opt = ["Use SQLite 3 Database", "Connect to your MySQL Database"]
 
@@ -41,10 +46,13 @@ selected_opt = st.sidebar.radio(label="Choose the DB which you want to chat", op
 
 if radio_opt.index(selected_opt) == 1:
     db_uri = MYSQL
-    mysql_host = st.sidebar.text_input("Provide MySQL Host")
-    mysql_user = st.sidebar.text_input("MySQL User")
-    mysql_password = st.sidebar.text_input("MySQL Password", type="password")
-    mysql_db = st.sidebar.text_input("MySQL Database")
+    # A form batches the connection fields, so typing in them does not rerun the app
+    with st.sidebar.form("mysql_connection"):
+        mysql_host = st.text_input("Provide MySQL Host")
+        mysql_user = st.text_input("MySQL User")
+        mysql_password = st.text_input("MySQL Password", type="password")
+        mysql_db = st.text_input("MySQL Database")
+        st.form_submit_button("Connect")
 else:
     db_uri = LOCALDB
     # Get list of available databases
@@ -62,6 +70,8 @@ else:
 
 api_key = st.sidebar.text_input(label="Groq API Key", type="password")
 
+sql_only = st.sidebar.checkbox("Return SQL only (fast)", help="Generate one SQL query and show its result as a table, without the agent's written answer")
+
 if not db_uri:
     st.info("Please enter the database information and URI.")
 
@@ -69,11 +79,137 @@ if not api_key:
     st.info("Please add the Groq API key.")
 
 # LLM Model (You can use your own model here)
-llm = ChatGroq(groq_api_key=groq_api_key, 
-               model_name="Llama-3.3-70b-versatile", 
-               temperature=0.0,
-               top_p=1.0,
-               streaming=True)
+LLM_MODEL = "Llama-3.3-70b-versatile"
+# Caps worst-case completion latency; a ReAct step or final answer fits comfortably
+LLM_MAX_TOKENS = 1024
+
+@st.cache_resource(show_spinner=False)
+def get_llm():
+    """Build the Groq chat model once and share it across reruns"""
+    from langchain_groq import ChatGroq
+
+    return ChatGroq(groq_api_key=groq_api_key, 
+                    model_name=LLM_MODEL, 
+                    temperature=0.0,
+                    top_p=1.0,
+                    max_tokens=LLM_MAX_TOKENS,
+                    max_retries=2,
+                    request_timeout=60,
+                    streaming=True)
+
+@st.cache_resource(show_spinner=False)
+def get_sqlite_engine(dbfilepath):
+    """Create one read-only SQLite engine per database file and reuse it across reruns"""
+    import sqlite3
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.pool import StaticPool
+
+    creator = lambda: sqlite3.connect(f"file:{dbfilepath}?mode=ro", uri=True, check_same_thread=False)
+    # A single long-lived connection is plenty for these small local databases
+    engine = create_engine("sqlite:///", creator=creator, poolclass=StaticPool)
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # Serve reads from the OS page cache through memory-mapped I/O (up to 1 GiB)
+        cursor.execute("PRAGMA mmap_size=1073741824")
+        # 64 MiB page cache and in-memory temp tables for sorts and joins
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA query_only=1")
+        cursor.close()
+
+    # Test the connection once, when the engine is first built
+    with engine.connect():
+        pass
+    return engine
+
+# host, host:port, [ipv6] or [ipv6]:port
+MYSQL_HOST_RE = re.compile(r"^(?:\[(?P<host6>[^\]\s]+)\]|(?P<host>[^@:\s\[\]]+))(?::(?P<port>\d+))?$")
+
+def mysql_credential_key(host, port, user, database, password):
+    """Non-secret digest of a MySQL credential set, keyed with the password"""
+    secret = password.encode()
+    if len(secret) > hashlib.blake2b.MAX_KEY_SIZE:
+        # BLAKE2b keys are limited to 64 bytes
+        secret = hashlib.blake2b(secret).digest()
+    fields = "\0".join((host, port, user, database)).encode()
+    return hashlib.blake2b(fields, key=secret, digest_size=16).hexdigest()
+
+def get_mysql_driver():
+    """Prefer the mysqlclient C driver and fall back to pure-Python PyMySQL"""
+    try:
+        import MySQLdb  # mysqlclient decodes rows and packets several times faster
+        return "mysqldb"
+    except ImportError:
+        import pymysql  # Fail early with a clear error if no MySQL driver is installed
+        return "pymysql"
+
+@st.cache_resource(show_spinner=False)
+def get_mysql_engine(credential_key, driver, host, port, user, database, _password):
+    """Create one pooled MySQL engine per credential set and share its pool across reruns"""
+    from urllib.parse import quote_plus
+    from sqlalchemy import create_engine
+
+    # URL encode password to handle special characters
+    encoded_password = quote_plus(_password)
+    connection_string = f"mysql+{driver}://{user}:{encoded_password}@{host}:{port}/{database}"
+
+    engine = create_engine(connection_string,
+                           pool_size=5,
+                           max_overflow=10,
+                           pool_pre_ping=True,  # Transparently replace connections dropped by the server
+                           pool_recycle=1800,  # Stay below MySQL's wait_timeout
+                           future=True)
+    with engine.connect():
+        pass
+    return engine
+
+@st.cache_resource(show_spinner=False)
+def get_sqldatabase(engine_key, _engine):
+    from database import CachedSQLDatabase
+
+    return CachedSQLDatabase(_engine)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_table_names(engine_key, _db):
+    return _db.get_table_names()
+
+def build_agent(sql_db):
+    """Initialize toolkit and agent for interacting with the database"""
+    from langchain.agents import create_sql_agent
+    from langchain.agents.agent_types import AgentType
+    from langchain.agents.agent_toolkits import SQLDatabaseToolkit
+
+    llm = get_llm()
+    toolkit = SQLDatabaseToolkit(db=sql_db, llm=llm)
+    return create_sql_agent(
+        llm=llm,
+        toolkit=toolkit,
+        verbose=True,
+        agent_type=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
+        handle_parsing_errors=True 
+    )
+
+@st.cache_resource(show_spinner=False)
+def get_embedding_model():
+    from sentence_transformers import SentenceTransformer
+    from cache import EMBEDDING_MODEL
+
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+@st.cache_resource(show_spinner=False)
+def get_table_embeddings(engine_key, tables, _db):
+    """Embed each table name with its column list, once per schema"""
+    descriptions = [_db.describe_table(table) for table in tables]
+    return get_embedding_model().encode(descriptions, normalize_embeddings=True)
+
+@st.cache_resource(show_spinner=False)
+def get_sql_chain(engine_key, _db):
+    """Question -> SQL chain used by the "SQL only" mode"""
+    from langchain.chains import create_sql_query_chain
+
+    return create_sql_query_chain(get_llm(), _db)
 
 def configure_db(db_uri, selected_db=None, mysql_host=None, mysql_user=None, mysql_password=None, mysql_db=None):
     if db_uri == LOCALDB:
@@ -82,13 +218,12 @@ def configure_db(db_uri, selected_db=None, mysql_host=None, mysql_user=None, mys
             st.error("No database selected")
             st.stop()
             
-        dbfilepath = (Path(__file__).parent / selected_db).absolute()
+        dbfilepath = str(PROJECT_ROOT / selected_db)
         st.write(f"Connecting to SQLite database: {dbfilepath}")
-        creator = lambda: sqlite3.connect(f"file:{dbfilepath}?mode=ro", uri=True)
         
         try:
-            db = SQLDatabase(create_engine("sqlite:///", creator=creator))
-            return db
+            # The file path (not the creator lambda) keys the engine cache
+            return f"sqlite:///{dbfilepath}", get_sqlite_engine(dbfilepath)
         except Exception as e:
             st.error(f"SQLite Connection Error: {str(e)}")
             st.stop()
@@ -98,38 +233,25 @@ def configure_db(db_uri, selected_db=None, mysql_host=None, mysql_user=None, mys
             st.error("Please provide all MySQL connection details.")
             st.stop()
 
-        try:
-            # Clean and validate host
-            mysql_host = mysql_host.strip()
-            if '@' in mysql_host:
-                raise ValueError("Host cannot contain '@' symbol.")
-            
-            # Handle host and port
-            if ":" in mysql_host:
-                host, port = mysql_host.rsplit(":", 1)
-                if not port.isdigit():
-                    raise ValueError("Port must be numeric.")
-            else:
-                host = mysql_host
-                port = "3306"  # Default MySQL port
-            
-            # URL encode password to handle special characters
-            encoded_password = quote_plus(mysql_password)
-            
-            # Build MySQL connection string
-            connection_string = f"mysql+pymysql://{mysql_user}:{encoded_password}@{host}:{port}/{mysql_db}"
-            st.write(f"Connecting to MySQL with connection string: {connection_string}")
+        # Clean, validate and split host and port in one pass
+        match = MYSQL_HOST_RE.match(mysql_host.strip())
+        if not match:
+            st.error("MySQL Connection Error: host must be host, host:port or [ipv6]:port, without '@' and with a numeric port.")
+            st.stop()
+        # IPv6 addresses keep their brackets, as the connection URL requires
+        host = f"[{match['host6']}]" if match["host6"] else match["host"]
+        port = match["port"] or "3306"  # Default MySQL port
 
-            # Create SQLAlchemy engine
-            engine = create_engine(connection_string)
+        try:
+            driver = get_mysql_driver()
+            st.write(f"Connecting to MySQL database {mysql_db} on {host}:{port} as {mysql_user}")
 
-            # Test the connection using a simple query:
-            with engine.connect() as conn:
-                st.write("Successfully connected to MySQL.")
-                # We don't need to execute a SELECT query here, we just want to confirm the connection works.
+            # Create (or reuse) the pooled SQLAlchemy engine; the password is only part of the key as a digest
+            key = mysql_credential_key(host, port, mysql_user, mysql_db, mysql_password)
+            engine = get_mysql_engine(key, driver, host, port, mysql_user, mysql_db, mysql_password)
+            st.write("Successfully connected to MySQL.")
 
-            # Return the database connection wrapped with SQLDatabase
-            return SQLDatabase(engine)
+            return f"mysql:{key}", engine
 
         except Exception as e:
             st.error(f"MySQL Connection Error: {str(e)}")
@@ -137,89 +259,227 @@ def configure_db(db_uri, selected_db=None, mysql_host=None, mysql_user=None, mys
 
 # Main database connection logic
 if db_uri == MYSQL:
-    db = configure_db(db_uri=db_uri,
-                      mysql_host=mysql_host,
-                      mysql_user=mysql_user,
-                      mysql_password=mysql_password,
-                      mysql_db=mysql_db)
+    engine_key, engine = configure_db(db_uri=db_uri,
+                                      mysql_host=mysql_host,
+                                      mysql_user=mysql_user,
+                                      mysql_password=mysql_password,
+                                      mysql_db=mysql_db)
 else:
-    db = configure_db(db_uri, selected_db=selected_db)
+    engine_key, engine = configure_db(db_uri, selected_db=selected_db)
+
+db = get_sqldatabase(engine_key, engine)
+
+# Table names and table info are cached, so schema changes only show up after a refresh
+if st.sidebar.button("Refresh schema"):
+    db.clear_cache()
+    get_table_names.clear()
+    get_table_embeddings.clear()
 
 try:
-    # Get schema of the database
-    schema = db.get_table_names()
+    # Get schema of the database (cached for a few minutes)
+    schema = get_table_names(engine_key, db)
     st.write("Database Schema:", schema)  # Log schema for debugging
 except Exception as e:
     st.error(f"Error retrieving schema: {str(e)}")
     schema = []
 
+# Only the tables most relevant to the question are named in the prompt
+RELEVANT_TABLES_K = 5
+
+def embed_query(user_query):
+    # Computed once per question and shared by the semantic cache and table selection
+    return get_embedding_model().encode([user_query], normalize_embeddings=True).astype("float32")
+
+def select_relevant_tables(query_embedding, k=RELEVANT_TABLES_K):
+    tables = tuple(schema)
+    if len(tables) <= k:
+        return tables
+    import numpy as np
+
+    table_embeddings = get_table_embeddings(engine_key, tables, db)
+    # Embeddings are normalized, so the dot product is the cosine similarity
+    top = np.argsort(table_embeddings @ query_embedding[0])[::-1][:k]
+    return tuple(tables[i] for i in top)
+
+# Semantic cache of previous answers, persisted under ./cache so it survives restarts
+@st.cache_resource(show_spinner=False)
+def get_semantic_cache():
+    from cache import SemanticCache
+
+    return SemanticCache(cache_dir=PROJECT_ROOT / "cache", model=get_embedding_model())
+
 # Define a function to format the query and enhance its clarity
-def format_query_for_agent(user_query, schema):
-    # Provide schema context to the agent
-    schema_hint = f"Database schema includes tables: {', '.join(schema)}. Please provide a detailed, formatted answer, including the relevant data in a human-readable way."
-
-    # Append the schema hint to the user's query to help the agent understand the required output
-    return f"{schema_hint}\nAnswer the question: {user_query}"
-
-# Initialize toolkit and agent for interacting with the database
-toolkit = SQLDatabaseToolkit(db=db, llm=llm)
-agent = create_sql_agent (
-    llm=llm,
-    toolkit=toolkit,
-    verbose=True,
-    agent_type=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
-    handle_parsing_errors=True 
-)
+def format_query_for_agent(user_query, query_embedding):
+    # Name only the relevant tables to keep the prompt short; the agent can still list all tables
+    tables = select_relevant_tables(query_embedding)
+    return f"Relevant tables: {', '.join(tables)}. Give a clear, human-readable answer.\nAnswer the question: {user_query}"
 
 # Initialize session state for storing chat messages and chat history
 if "messages" not in st.session_state or st.sidebar.button("Clear message history"):
     st.session_state["messages"] = [{"role": "assistant", "content": "How can I help you?"}]
     
-# Initialize chat_history if it doesn't exist
-if "chat_history" not in st.session_state:
-    st.session_state["chat_history"] = []
+# Chat history is appended to a local SQLite file instead of being kept in session_state
+@st.cache_resource(show_spinner=False)
+def get_history_store():
+    from history import ChatHistoryStore
+
+    return ChatHistoryStore(PROJECT_ROOT / "chat_history.db")
+
+# Identify this session's rows in the shared history file
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = uuid.uuid4().hex
 
 # Display chat messages
 for msg in st.session_state.messages:
     st.chat_message(msg["role"]).write(msg["content"])
 
+# Shared by every session, so identical questions asked concurrently run the agent once
+@st.cache_resource(show_spinner=False)
+def get_coalescer():
+    from coalesce import RequestCoalescer
+
+    return RequestCoalescer()
+
+def answer_with_agent(user_query):
+    """Answer through the SQL agent (or the semantic cache) and return (response, sql)"""
+    from cache import fingerprint
+
+    # Hashed so connection details never end up in the cache files
+    db_key = fingerprint(engine_key)
+    schema_key = fingerprint(sorted(schema))
+
+    # The same question already running in another session waits for that run instead of
+    # calling the agent again. Within one session a resubmit interrupts the running script,
+    # so it is not coalesced
+    request_key = hashlib.sha1("\0".join((db_key, schema_key, user_query)).encode()).hexdigest()
+    (response, sql), computed = get_coalescer().run(
+        request_key, lambda: run_agent(user_query, db_key, schema_key))
+    if not computed:
+        st.write(response)
+    return response, sql
+
+def run_agent(user_query, db_key, schema_key):
+    query_embedding = embed_query(user_query)
+
+    # Serve repeated or paraphrased questions from the semantic cache
+    semantic_cache = get_semantic_cache()
+    semantic_cache.invalidate(db_key, schema_key)
+    cached = semantic_cache.lookup(user_query, db_key, schema_key, llm=get_llm(), embedding=query_embedding)
+    if cached:
+        st.write(cached["response"])
+        return cached["response"], cached["sql"]
+
+    # The prompt (and its table selection) is only needed when the agent actually runs
+    formatted_query = format_query_for_agent(user_query, query_embedding)
+
+    from langchain.callbacks import StreamlitCallbackHandler
+    from callbacks import FinalAnswerStreamHandler, SQLCaptureHandler
+
+    # Each session builds its own agent (the LLM and database underneath are shared) and
+    # keeps it until the database or model changes
+    agent_key = (engine_key, LLM_MODEL)
+    if st.session_state.get("agent_key") != agent_key:
+        st.session_state["agent"] = build_agent(db)
+        st.session_state["agent_key"] = agent_key
+    agent = st.session_state.agent
+    # One handler renders the intermediate steps; the other streams the final answer's tokens
+    # as soon as the LLM starts writing it, instead of waiting for the agent to finish
+    streamlit_callback = StreamlitCallbackHandler(st.container())
+    answer_stream = FinalAnswerStreamHandler(st.container())
+    sql_capture = SQLCaptureHandler()
+
+    result = agent.invoke({"input": formatted_query},
+                          {"callbacks": [streamlit_callback, answer_stream, sql_capture]})
+    response = result["output"]
+    answer_stream.finish(response)
+    sql = ";\n".join(sql_capture.queries)
+    semantic_cache.add(user_query, response, db_key, schema_key, sql=sql, embedding=query_embedding)
+    return response, sql
+
+# A markdown code fence around the whole statement, e.g. ```sql ... ```
+SQL_FENCE_RE = re.compile(r"^```[A-Za-z]*[ \t]*\n(?P<sql>.*?)\n?```$", re.DOTALL)
+
+def clean_sql(text):
+    # The chain may wrap the statement in a "SQLQuery:" label or a markdown code fence; only
+    # those wrappers are removed, backticks quoting identifiers are part of the SQL
+    sql = text.strip()
+    if "SQLQuery:" in sql:
+        sql = sql.split("SQLQuery:", 1)[1].strip()
+    match = SQL_FENCE_RE.match(sql)
+    if match:
+        sql = match["sql"].strip()
+    return sql
+
+def answer_with_sql(user_query):
+    """Generate a single SQL statement, run it locally and return (DataFrame, sql)"""
+    import pandas as pd
+
+    sql = clean_sql(get_sql_chain(engine_key, db).invoke({"question": user_query}))
+    st.code(sql, language="sql")
+    try:
+        df = pd.read_sql(sql, db._engine)
+    except Exception as e:
+        st.error(f"Error running query: {str(e)}")
+        return None, sql
+    st.dataframe(df)
+    return df, sql
+
 # Accept user query and process it
 user_query = st.chat_input(placeholder="Ask anything from the database")
 
 if user_query:
-    formatted_query = format_query_for_agent(user_query, schema)
     st.session_state.messages.append({"role": "user", "content": user_query})
     st.chat_message("user").write(user_query)
 
+    ts_ns = time.time_ns()
+    started = time.perf_counter()
     with st.chat_message("assistant"):
-        streamlit_callback = StreamlitCallbackHandler(st.container())
-        response = agent.run(formatted_query, callbacks=[streamlit_callback])
-        st.session_state.messages.append({"role": "assistant", "content": response})
-        st.write(response)
+        if sql_only:
+            # Fast path: no agent loop and no final summarization call
+            df, sql_query = answer_with_sql(user_query)
+            st.session_state.messages.append({"role": "assistant", "content": f"```sql\n{sql_query}\n```"})
+            if df is not None:
+                st.session_state.messages.append({"role": "assistant", "content": df})
+            response = str(df.head().to_dict()) if df is not None else ""
+        else:
+            response, sql_query = answer_with_agent(user_query)
+            st.session_state.messages.append({"role": "assistant", "content": response})
+        latency_ms = round((time.perf_counter() - started) * 1000)
+        st.caption(f"Answered in {latency_ms / 1000:.2f} s")
 
         # Save the response along with the SQL queries that were executed (SQL query chain)
-        st.session_state.chat_history.append({
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),  # Timestamp for when the query is made
+        get_history_store().append(st.session_state.session_id, {
+            "ts_ns": ts_ns,  # Timestamp for when the query is made
             "user_query": user_query,
-            "sql_query": formatted_query,  # You may want to log the exact SQL query here
-            "response": response
+            "sql_query": sql_query,  # The SQL the agent or the SQL-only chain executed
+            "response": response,
+            "latency_ms": latency_ms
         })
 
-        st.write(response)
+# Saving full chat history from the history store
+CSV_FIELDS = ("timestamp", "user_query", "sql_query", "response", "latency_ms")
+
+def to_csv(rows):
+    # Write the chat history straight to an in-memory CSV, formatting timestamps only here
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(CSV_FIELDS)
+    writer.writerows(
+        (datetime.fromtimestamp(ts_ns / 1e9).isoformat(sep=" ", timespec="seconds"), *rest)
+        for ts_ns, *rest in rows
+    )
+    return buf.getvalue().encode()
+
+# Provide the option to download the full chat history as CSV; the CSV is only built on
+# request, and as a fragment the button reruns only this block instead of the whole app
+@st.fragment
+def chat_history_download():
+    if st.button("Prepare Chat History Download"):
+        st.download_button(
+            label="Download Full Chat History with SQL Queries as CSV",
+            data=to_csv(get_history_store().rows(st.session_state.session_id)),
+            file_name="chat_history.csv",
+            mime="text/csv"
+        )
 
-# Saving full chat history in the session state
-def to_csv(chat_history):
-    # Convert the chat history to a DataFrame
-    df = pd.DataFrame(chat_history)
-    # Convert dataframe to CSV without saving to disk
-    csv = df.to_csv(index=False).encode()
-    return csv
-
-# Provide the option to download the full chat history as CSV
-csv_data = to_csv(st.session_state.chat_history)
-st.download_button(
-    label="Download Full Chat History with SQL Queries as CSV",
-    data=csv_data,
-    file_name="chat_history.csv",
-    mime="text/csv"
-)
+chat_history_download()
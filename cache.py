@@ -0,0 +1,202 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Similarity above HIT_THRESHOLD is served straight from the cache, similarity between
+# CHECK_THRESHOLD and HIT_THRESHOLD is served only if the LLM agrees the questions match
+HIT_THRESHOLD = 0.92
+CHECK_THRESHOLD = 0.85
+
+EQUIVALENCE_PROMPT = """Do the two questions below ask for exactly the same data from the database?
+Answer with a single word: YES or NO.
+
+Question 1: {first}
+Question 2: {second}"""
+
+# LangChain's AgentExecutor returns this when it gives up instead of answering
+AGENT_STOPPED_PREFIX = "Agent stopped due to"
+
+
+def is_cacheable(response):
+    """Only real answers are cached; empty or stopped runs would be served to every similar question"""
+    return bool(response and response.strip()) and not response.startswith(AGENT_STOPPED_PREFIX)
+
+
+def fingerprint(*parts):
+    """Stable digest of the given values (unlike hash(), it survives restarts)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+class SemanticCache:
+    """FAISS index of previous user questions mapped to their final responses and SQL"""
+
+    def __init__(self, cache_dir="cache", model=None, search_k=5,
+                 max_entries=1000, max_age=30 * 24 * 3600):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Append-only log of added and removed entries; the index is rebuilt from it on load
+        self.log_path = self.cache_dir / "responses.jsonl"
+        # Callers may pass a model they already loaded to avoid keeping a second copy
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+
+            model = SentenceTransformer(EMBEDDING_MODEL)
+        self.model = model
+        self.search_k = search_k
+        # Oldest entries are evicted beyond max_entries, and entries older than max_age
+        # seconds are dropped on load, so entries under obsolete database keys age out
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._checked_schemas = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        records = {}
+        log_lines = 0
+        damaged = False
+        if self.log_path.exists():
+            with open(self.log_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash; the rewrite below drops it, so the
+                        # next append does not land on the end of the partial line
+                        damaged = True
+                        continue
+                    log_lines += 1
+                    if record["op"] == "add":
+                        records[record["id"]] = record
+                    else:
+                        for i in record["ids"]:
+                            records.pop(i, None)
+
+        cutoff = time.time() - self.max_age
+        live = sorted((r for r in records.values() if r["created"] >= cutoff), key=lambda r: r["id"])
+        live = live[-self.max_entries:]
+
+        dim = self.model.get_sentence_embedding_dimension()
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        self.records = {r["id"]: r for r in live}
+        self.next_id = max(records, default=-1) + 1
+        if live:
+            embeddings = np.stack([self._decode(r["embedding"]) for r in live])
+            self.index.add_with_ids(embeddings, np.array([r["id"] for r in live], dtype="int64"))
+
+        # Compact the log once at startup when it holds removed, expired or damaged entries
+        if damaged or log_lines != len(live):
+            self._rewrite()
+
+    def _rewrite(self):
+        tmp_path = self.log_path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in self.records.values():
+                f.write(json.dumps(record) + "\n")
+        os.replace(tmp_path, self.log_path)
+
+    def _append(self, record):
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def _remove(self, ids):
+        self.index.remove_ids(np.array(ids, dtype="int64"))
+        for i in ids:
+            del self.records[i]
+        self._append({"op": "remove", "ids": ids})
+
+    @staticmethod
+    def _encode(embedding):
+        return base64.b64encode(embedding.astype("float32").tobytes()).decode("ascii")
+
+    @staticmethod
+    def _decode(data):
+        return np.frombuffer(base64.b64decode(data), dtype="float32")
+
+    def invalidate(self, db_key, schema_key):
+        """Drop entries recorded for this database against a schema that no longer matches"""
+        with self._lock:
+            # Checked once per schema and process rather than on every question
+            if (db_key, schema_key) in self._checked_schemas:
+                return
+            self._checked_schemas.add((db_key, schema_key))
+            stale = [i for i, r in self.records.items()
+                     if r["entry"]["db_key"] == db_key and r["entry"]["schema_fingerprint"] != schema_key]
+            if stale:
+                self._remove(stale)
+
+    def _embed(self, text):
+        # Normalized embeddings make the inner product equal to cosine similarity
+        return self.model.encode([text], normalize_embeddings=True).astype("float32")
+
+    def lookup(self, user_query, db_key, schema_key, llm=None, embedding=None):
+        """Return the cached entry for a similar question on the same schema, or None on a miss"""
+        # Callers that already embedded the question pass it in to avoid encoding it twice
+        if embedding is None:
+            embedding = self._embed(user_query)
+        with self._lock:
+            if self.index.ntotal == 0:
+                return None
+            scores, ids = self.index.search(embedding, min(self.search_k, self.index.ntotal))
+            # Results are sorted by similarity, so the first match for this schema is the best one
+            for score, entry_id in zip(scores[0], ids[0]):
+                record = self.records.get(int(entry_id))
+                if record and record["entry"]["db_key"] == db_key and record["entry"]["schema_fingerprint"] == schema_key:
+                    entry = record["entry"]
+                    break
+            else:
+                return None
+        score = float(score)
+        if score >= HIT_THRESHOLD:
+            return entry
+        if score >= CHECK_THRESHOLD and llm is not None and self._equivalent(llm, user_query, entry["user_query"]):
+            return entry
+        return None
+
+    def _equivalent(self, llm, first, second):
+        try:
+            answer = llm.invoke(EQUIVALENCE_PROMPT.format(first=first, second=second)).content
+        except Exception:
+            return False
+        return answer.strip().upper().startswith("YES")
+
+    def add(self, user_query, response, db_key, schema_key, sql=None, embedding=None):
+        if not is_cacheable(response):
+            return
+        if embedding is None:
+            embedding = self._embed(user_query)
+        with self._lock:
+            entry_id = self.next_id
+            self.next_id += 1
+            record = {
+                "op": "add",
+                "id": entry_id,
+                "created": time.time(),
+                "embedding": self._encode(embedding[0]),
+                "entry": {
+                    "user_query": user_query,
+                    "response": response,
+                    "sql": sql,
+                    "db_key": db_key,
+                    "schema_fingerprint": schema_key,
+                },
+            }
+            self.index.add_with_ids(embedding, np.array([entry_id], dtype="int64"))
+            self.records[entry_id] = record
+            self._append(record)
+            # Ids grow monotonically, so the smallest ones are the oldest entries
+            overflow = len(self.records) - self.max_entries
+            if overflow > 0:
+                self._remove(sorted(self.records)[:overflow])
@@ -0,0 +1,39 @@
+from langchain.callbacks.base import BaseCallbackHandler
+
+
+class SQLCaptureHandler(BaseCallbackHandler):
+    """Collect the SQL statements the agent sends to the sql_db_query tool"""
+
+    def __init__(self):
+        self.queries = []
+
+    def on_tool_start(self, serialized, input_str, **kwargs):
+        if (serialized or {}).get("name") == "sql_db_query":
+            self.queries.append(input_str)
+
+
+class FinalAnswerStreamHandler(BaseCallbackHandler):
+    """Render the agent's final answer token by token once the LLM emits "Final Answer:" """
+
+    MARKER = "Final Answer:"
+
+    def __init__(self, container):
+        self.placeholder = container.empty()
+        self.buffer = ""
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        # Each ReAct step is a new LLM call; only the one that answers contains the marker
+        self.buffer = ""
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.buffer = ""
+
+    def on_llm_new_token(self, token, **kwargs):
+        self.buffer += token
+        _, marker, answer = self.buffer.partition(self.MARKER)
+        if marker and answer.strip():
+            self.placeholder.markdown(answer.strip())
+
+    def finish(self, response):
+        # The agent's parsed output is authoritative, e.g. when the answer came from a parsing fallback
+        self.placeholder.markdown(response)
@@ -0,0 +1,44 @@
+import threading
+import time
+
+
+class RequestCoalescer:
+    """Run identical concurrent requests once and hand the result to every caller"""
+
+    def __init__(self, ttl=30, wait_timeout=150):
+        # Finished results are kept briefly so an identical request just after is reused
+        self.ttl = ttl
+        # Bounds how long a waiting caller blocks; its thread cannot be interrupted meanwhile
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._results = {}
+
+    def run(self, key, fn):
+        """Return (result, computed); computed is False when the result came from another caller"""
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                for k in [k for k, (_, expires) in self._results.items() if expires <= now]:
+                    del self._results[k]
+                if key in self._results:
+                    return self._results[key][0], False
+                event = self._inflight.get(key)
+                if event is None:
+                    # Either the first caller, or the first one to notice the previous run failed
+                    event = self._inflight[key] = threading.Event()
+                    break
+            if not event.wait(max(deadline - time.monotonic(), 0)):
+                # The running request is taking too long, so stop waiting and run it here
+                return fn(), True
+
+        try:
+            result = fn()
+            with self._lock:
+                self._results[key] = (result, time.monotonic() + self.ttl)
+            return result, True
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
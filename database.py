@@ -0,0 +1,39 @@
+from functools import lru_cache
+
+from langchain.sql_database import SQLDatabase
+
+
+class CachedSQLDatabase(SQLDatabase):
+    """SQLDatabase that memoizes table names and table info (DDL + sample rows)"""
+
+    def __init__(self, *args, **kwargs):
+        # Per-instance caches, so clearing one database never affects another. They must exist
+        # before SQLDatabase.__init__, which already calls get_usable_table_names()
+        self._cached_usable_table_names = lru_cache(maxsize=1)(self._load_usable_table_names)
+        self._cached_table_info = lru_cache(maxsize=256)(self._load_table_info)
+        self._init_args = (args, kwargs)
+        super().__init__(*args, **kwargs)
+
+    def _load_usable_table_names(self):
+        return tuple(super().get_usable_table_names())
+
+    def _load_table_info(self, table_names):
+        return super().get_table_info(sorted(table_names) or None)
+
+    def get_usable_table_names(self):
+        return list(self._cached_usable_table_names())
+
+    def get_table_info(self, table_names=None):
+        # The output follows the metadata order, so the requested order does not matter
+        return self._cached_table_info(frozenset(table_names or ()))
+
+    def describe_table(self, table_name):
+        """Short "table: column, column" description, used to embed the schema"""
+        columns = self._inspector.get_columns(table_name, schema=self._schema)
+        return f"{table_name}: {', '.join(c['name'] for c in columns)}"
+
+    def clear_cache(self):
+        """Drop the cached results and reflect the schema again"""
+        # SQLDatabase reads the table list and reflects the metadata once, in __init__
+        args, kwargs = self._init_args
+        self.__init__(*args, **kwargs)
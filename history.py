@@ -0,0 +1,69 @@
+import sqlite3
+import threading
+
+# Timestamps are stored as integer nanoseconds and only formatted when exporting
+HISTORY_FIELDS = ("ts_ns", "user_query", "sql_query", "response", "latency_ms")
+
+# Bumped whenever the table layout changes; _migrate upgrades older files
+SCHEMA_VERSION = 1
+CREATE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS chat_history ("
+    "session_id TEXT, ts_ns INTEGER, user_query TEXT, sql_query TEXT, response TEXT, latency_ms INTEGER)"
+)
+COPY_V0_ROWS = (
+    "INSERT INTO chat_history "
+    "SELECT session_id, CAST(strftime('%s', timestamp, 'utc') AS INTEGER) * 1000000000, "
+    "user_query, sql_query, response, NULL FROM chat_history_v0 ORDER BY rowid"
+)
+
+
+class ChatHistoryStore:
+    """Append-only chat history in a local SQLite file, one row per answered question"""
+
+    def __init__(self, path):
+        # Autocommit mode leaves transactions to us, so _migrate can run as a single one
+        self.conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._migrate()
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def _migrate(self):
+        """Bring the chat_history table up to SCHEMA_VERSION, tracked in PRAGMA user_version"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        tables = {row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        # chat_history_v0 is only left behind by an interrupted non-transactional upgrade
+        if version >= SCHEMA_VERSION and "chat_history_v0" not in tables:
+            return
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(chat_history)")}
+        if "timestamp" in columns:
+            # Version 0 stored local "YYYY-MM-DD HH:MM:SS" text and no latency
+            self.conn.execute("ALTER TABLE chat_history RENAME TO chat_history_v0")
+            tables.add("chat_history_v0")
+        self.conn.execute(CREATE_TABLE)
+        if "chat_history_v0" in tables:
+            self.conn.execute(COPY_V0_ROWS)
+            self.conn.execute("DROP TABLE chat_history_v0")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS chat_history_session ON chat_history (session_id)"
+        )
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def append(self, session_id, entry):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO chat_history VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, *(entry[field] for field in HISTORY_FIELDS)),
+            )
+
+    def rows(self, session_id):
+        with self._lock:
+            return self.conn.execute(
+                f"SELECT {', '.join(HISTORY_FIELDS)} FROM chat_history WHERE session_id = ? ORDER BY rowid",
+                (session_id,),
+            ).fetchall()
@@ -0,0 +1,136 @@
+import math
+
+import numpy as np
+import pytest
+
+from cache import SemanticCache, is_cacheable
+
+# Hand-picked unit vectors, so each pair's cosine similarity is known exactly
+VECTORS = {
+    "how many students": [1, 0, 0, 0, 0, 0, 0, 0],
+    "count the students": [0.95, math.sqrt(1 - 0.95 ** 2), 0, 0, 0, 0, 0, 0],
+    "students per class": [0.88, 0, math.sqrt(1 - 0.88 ** 2), 0, 0, 0, 0, 0],
+    "list all films": [0, 0, 0, 1, 0, 0, 0, 0],
+    "q1": [0, 0, 0, 0, 1, 0, 0, 0],
+    "q2": [0, 0, 0, 0, 0, 1, 0, 0],
+    "q3": [0, 0, 0, 0, 0, 0, 1, 0],
+}
+
+
+class StubModel:
+    """SentenceTransformer stand-in returning the fixed VECTORS"""
+
+    def get_sentence_embedding_dimension(self):
+        return 8
+
+    def encode(self, texts, normalize_embeddings=True):
+        return np.array([VECTORS[t] for t in texts], dtype="float32")
+
+
+class StubLLM:
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return type("Message", (), {"content": self.answer})()
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    def make(**kwargs):
+        return SemanticCache(cache_dir=tmp_path, model=StubModel(), **kwargs)
+    return make
+
+
+def test_add_then_lookup_and_after_reload(make_cache):
+    cache = make_cache()
+    cache.add("how many students", "There are 3 students.", "db", "s1", sql="SELECT COUNT(*) FROM student")
+    entry = cache.lookup("how many students", "db", "s1")
+    assert entry["response"] == "There are 3 students."
+    assert entry["sql"] == "SELECT COUNT(*) FROM student"
+
+    reloaded = make_cache()
+    assert reloaded.lookup("count the students", "db", "s1")["response"] == "There are 3 students."
+    assert reloaded.lookup("list all films", "db", "s1") is None
+
+
+def test_lookup_is_scoped_to_database_and_schema(make_cache):
+    cache = make_cache()
+    cache.add("how many students", "3", "db", "s1")
+    assert cache.lookup("how many students", "other-db", "s1") is None
+    assert cache.lookup("how many students", "db", "s2") is None
+
+
+def test_between_thresholds_the_llm_decides(make_cache):
+    cache = make_cache()
+    cache.add("how many students", "3", "db", "s1")
+    # 0.88 similarity sits between CHECK_THRESHOLD and HIT_THRESHOLD
+    assert cache.lookup("students per class", "db", "s1") is None
+    assert cache.lookup("students per class", "db", "s1", llm=StubLLM("NO")) is None
+    assert cache.lookup("students per class", "db", "s1", llm=StubLLM("YES"))["response"] == "3"
+
+    # Above HIT_THRESHOLD the LLM is not consulted
+    llm = StubLLM("NO")
+    assert cache.lookup("count the students", "db", "s1", llm=llm)["response"] == "3"
+    assert llm.calls == 0
+
+
+def test_evicts_oldest_past_max_entries(make_cache):
+    cache = make_cache(max_entries=2)
+    for query in ("q1", "q2", "q3"):
+        cache.add(query, f"answer to {query}", "db", "s1")
+    assert cache.lookup("q1", "db", "s1") is None
+    assert cache.lookup("q3", "db", "s1")["response"] == "answer to q3"
+
+    reloaded = make_cache(max_entries=2)
+    assert reloaded.lookup("q1", "db", "s1") is None
+    assert reloaded.lookup("q2", "db", "s1")["response"] == "answer to q2"
+
+
+def test_expired_entries_are_dropped_on_load(make_cache):
+    make_cache().add("q1", "a1", "db", "s1")
+    assert make_cache(max_age=-1).lookup("q1", "db", "s1") is None
+
+
+def test_invalidate_on_schema_change(make_cache):
+    cache = make_cache()
+    cache.add("q1", "a1", "db", "s1")
+    cache.add("q2", "a2", "other-db", "s1")
+    cache.invalidate("db", "s2")
+    assert cache.lookup("q1", "db", "s1") is None
+    # Other databases are untouched
+    assert cache.lookup("q2", "other-db", "s1")["response"] == "a2"
+    assert make_cache().lookup("q1", "db", "s1") is None
+
+
+def test_failed_answers_are_not_cached(make_cache):
+    assert is_cacheable("There are 3 students.")
+    assert not is_cacheable("")
+    assert not is_cacheable("  ")
+    assert not is_cacheable("Agent stopped due to iteration limit or time limit.")
+
+    cache = make_cache()
+    cache.add("q1", "Agent stopped due to iteration limit or time limit.", "db", "s1")
+    cache.add("q2", "", "db", "s1")
+    assert cache.lookup("q1", "db", "s1") is None
+    assert cache.lookup("q2", "db", "s1") is None
+
+
+def test_recovers_from_truncated_last_line(make_cache, tmp_path):
+    cache = make_cache()
+    cache.add("q1", "a1", "db", "s1")
+    cache.add("q2", "a2", "db", "s1")
+    log_path = tmp_path / "responses.jsonl"
+    data = log_path.read_bytes()
+    log_path.write_bytes(data[:-20])  # Crash in the middle of writing q2
+
+    recovered = make_cache()
+    assert recovered.lookup("q1", "db", "s1")["response"] == "a1"
+    assert recovered.lookup("q2", "db", "s1") is None
+    recovered.add("q3", "a3", "db", "s1")
+
+    restarted = make_cache()
+    assert restarted.lookup("q1", "db", "s1")["response"] == "a1"
+    assert restarted.lookup("q3", "db", "s1")["response"] == "a3"
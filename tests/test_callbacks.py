@@ -0,0 +1,44 @@
+from callbacks import FinalAnswerStreamHandler, SQLCaptureHandler
+
+
+class FakePlaceholder:
+    def __init__(self):
+        self.rendered = []
+
+    def markdown(self, text):
+        self.rendered.append(text)
+
+
+class FakeContainer:
+    def __init__(self):
+        self.placeholder = FakePlaceholder()
+
+    def empty(self):
+        return self.placeholder
+
+
+def test_streams_only_tokens_after_the_final_answer_marker():
+    container = FakeContainer()
+    handler = FinalAnswerStreamHandler(container)
+
+    # An intermediate ReAct step renders nothing
+    handler.on_chat_model_start({}, [])
+    for token in ["Thought: look at ", "tables\nAction: sql_db_list_tables"]:
+        handler.on_llm_new_token(token)
+    assert container.placeholder.rendered == []
+
+    # The marker may be split across tokens
+    handler.on_chat_model_start({}, [])
+    for token in ["Thought: done\nFinal ", "Answer: There are", " 3 students"]:
+        handler.on_llm_new_token(token)
+    assert container.placeholder.rendered == ["There are", "There are 3 students"]
+
+    handler.finish("There are 3 students.")
+    assert container.placeholder.rendered[-1] == "There are 3 students."
+
+
+def test_sql_capture_records_only_query_tool_inputs():
+    handler = SQLCaptureHandler()
+    handler.on_tool_start({"name": "sql_db_list_tables"}, "")
+    handler.on_tool_start({"name": "sql_db_query"}, "SELECT COUNT(*) FROM student")
+    assert handler.queries == ["SELECT COUNT(*) FROM student"]
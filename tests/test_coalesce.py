@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from coalesce import RequestCoalescer
+
+
+def run_concurrently(coalescer, fn, callers=5):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(coalescer.run("key", fn))) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_concurrent_requests_run_once():
+    calls = []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.2)
+        return "answer"
+
+    results = run_concurrently(RequestCoalescer(), fn)
+    assert len(calls) == 1
+    assert sorted(results) == [("answer", False)] * 4 + [("answer", True)]
+
+
+def test_follower_takes_over_after_a_failed_leader():
+    calls = []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.2)
+        if len(calls) == 1:
+            raise ValueError("first run fails")
+        return "answer"
+
+    coalescer = RequestCoalescer()
+
+    def leader():
+        with pytest.raises(ValueError):
+            coalescer.run("key", fn)
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    time.sleep(0.05)
+    results = run_concurrently(coalescer, fn, callers=3)
+    thread.join()
+    # One follower reruns the request; the others reuse its result
+    assert len(calls) == 2
+    assert sorted(results) == [("answer", False)] * 2 + [("answer", True)]
+
+
+def test_wait_is_bounded():
+    coalescer = RequestCoalescer(wait_timeout=0.1)
+    release = threading.Event()
+    thread = threading.Thread(target=lambda: coalescer.run("key", lambda: release.wait(5)))
+    thread.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    assert coalescer.run("key", lambda: "own") == ("own", True)
+    assert time.monotonic() - started < 1
+    release.set()
+    thread.join()
@@ -0,0 +1,39 @@
+import sqlite3
+
+from sqlalchemy import create_engine
+
+from database import CachedSQLDatabase
+
+
+def make_db(tmp_path):
+    path = tmp_path / "test.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE student (name TEXT, marks INTEGER)")
+    conn.execute("INSERT INTO student VALUES ('Krish', 90)")
+    conn.commit()
+    conn.close()
+    return path, CachedSQLDatabase(create_engine(f"sqlite:///{path}"))
+
+
+def test_table_names_and_info(tmp_path):
+    _, db = make_db(tmp_path)
+    assert db.get_table_names() == ["student"]
+    info = db.get_table_info(["student"])
+    assert "CREATE TABLE student" in info
+    assert "Krish" in info
+
+
+def test_results_are_cached_until_cleared(tmp_path):
+    path, db = make_db(tmp_path)
+    info = db.get_table_info()
+
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE course (title TEXT)")
+    conn.commit()
+    conn.close()
+
+    assert db.get_table_names() == ["student"]
+    assert db.get_table_info() == info
+
+    db.clear_cache()
+    assert db.get_table_names() == ["course", "student"]
@@ -0,0 +1,77 @@
+import sqlite3
+import time
+from datetime import datetime
+
+import pytest
+
+import history
+from history import ChatHistoryStore
+
+
+def make_v0_file(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE chat_history (session_id TEXT, timestamp TEXT, user_query TEXT, sql_query TEXT, response TEXT)")
+    conn.execute("CREATE INDEX chat_history_session ON chat_history (session_id)")
+    conn.execute("INSERT INTO chat_history VALUES ('a', '2024-05-01 10:30:00', 'q', 's', 'r')")
+    conn.commit()
+    conn.close()
+
+
+def table_names(path):
+    conn = sqlite3.connect(path)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    conn.close()
+    return names
+
+
+def test_append_and_rows_per_session(tmp_path):
+    store = ChatHistoryStore(tmp_path / "chat_history.db")
+    entry = {"ts_ns": time.time_ns(), "user_query": "q", "sql_query": "SELECT 1", "response": "r", "latency_ms": 12}
+    store.append("a", entry)
+    store.append("b", dict(entry, user_query="other"))
+    assert store.rows("a") == [(entry["ts_ns"], "q", "SELECT 1", "r", 12)]
+
+
+def test_migrates_text_timestamp_layout(tmp_path):
+    path = tmp_path / "chat_history.db"
+    make_v0_file(path)
+
+    store = ChatHistoryStore(path)
+    [(ts_ns, *rest)] = store.rows("a")
+    assert rest == ["q", "s", "r", None]
+    assert datetime.fromtimestamp(ts_ns / 1e9) == datetime(2024, 5, 1, 10, 30)
+
+    store.append("a", {"ts_ns": 1, "user_query": "q2", "sql_query": "s2", "response": "r2", "latency_ms": 5})
+    assert len(store.rows("a")) == 2
+    # Opening the migrated file again is a no-op
+    assert len(ChatHistoryStore(path).rows("a")) == 2
+
+
+def test_interrupted_migration_is_rolled_back(tmp_path, monkeypatch):
+    path = tmp_path / "chat_history.db"
+    make_v0_file(path)
+
+    monkeypatch.setattr(history, "COPY_V0_ROWS", "INSERT INTO chat_history SELECT * FROM missing_table")
+    with pytest.raises(sqlite3.OperationalError):
+        ChatHistoryStore(path)
+    # Nothing was committed: the file still has only the original table
+    assert table_names(path) == {"chat_history"}
+
+    monkeypatch.undo()
+    assert [row[1:] for row in ChatHistoryStore(path).rows("a")] == [("q", "s", "r", None)]
+    assert table_names(path) == {"chat_history"}
+
+
+def test_finishes_a_leftover_v0_table(tmp_path):
+    # State left by an upgrade that renamed the table but never copied the rows
+    path = tmp_path / "chat_history.db"
+    make_v0_file(path)
+    conn = sqlite3.connect(path)
+    conn.execute("ALTER TABLE chat_history RENAME TO chat_history_v0")
+    conn.execute(history.CREATE_TABLE)
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+    assert [row[1:] for row in ChatHistoryStore(path).rows("a")] == [("q", "s", "r", None)]
+    assert table_names(path) == {"chat_history"}